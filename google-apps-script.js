@@ -1,6 +1,6 @@
 /**
  * Google Apps Script Backend for Hours Worked Tracker
- * VERSION: 2.0.50
+ * VERSION: 2.1.0
  *
  * Supports 5-tab CRUD + Gmail email parsing for DA/PayPal payouts.
  *
@@ -54,6 +54,9 @@ const TABS = {
   Settings: ['Key', 'Value']
 };
 
+// Longest a write waits for another write to finish before giving up
+const WRITE_LOCK_WAIT_MS = 30000;
+
 // ============ HTTP Handlers ============
 
 function doGet(e) {
@@ -103,7 +106,7 @@ function doGet(e) {
     const view = e.parameter.view || 'personal';
     const isUserScoped = USER_SCOPED_TABS.indexOf(tab) !== -1;
 
-    const records = data.slice(1).map(row => {
+    let records = data.slice(1).map(row => {
       const record = {};
       headers.forEach((h, i) => {
         let val = row[i];
@@ -113,6 +116,26 @@ function doGet(e) {
       return record;
     }).filter(r => r.id || r.key); // Filter empty rows
 
+    // Scraper reconciliation: only return WorkSessions that could match a
+    // scraped DA entry — SubmittedAtMs at/after `sinceMs` (primary-key match),
+    // or no SubmittedAtMs yet (legacy match), narrowed to earnings equal to one
+    // of `amounts` when the scraper sends that list.
+    if (tab === 'WorkSessions' && (e.parameter.amounts || e.parameter.sinceMs)) {
+      var amountCents = null;
+      if (e.parameter.amounts) {
+        amountCents = {};
+        e.parameter.amounts.split(',').forEach(function(a) {
+          amountCents[Math.round(parseFloat(a) * 100)] = true;
+        });
+      }
+      var sinceMs = parseInt(e.parameter.sinceMs || '0', 10) || 0;
+      records = records.filter(function(r) {
+        var ms = parseInt(r.submittedAtMs, 10) || 0;
+        if (ms > 0) return sinceMs > 0 && ms >= sinceMs;
+        return !amountCents || amountCents[Math.round((parseFloat(r.earnings) || 0) * 100)] === true;
+      });
+    }
+
     // Filter by user in personal view (skip for shared tabs or family view)
     if (userEmail && view === 'personal' && isUserScoped) {
       var filtered = records.filter(function(r) {
@@ -138,30 +161,95 @@ function doPost(e) {
     const action = data.action;
     const tab = data.tab;
 
+    // Bulk: many add/update operations in one request (used by the DA scraper)
+    if (action === 'bulk') {
+      return withScriptLock(function() {
+        return createResponse(runBulkOperations(data.operations || []));
+      });
+    }
+
     if (!tab || !TABS[tab]) {
       return createResponse({ error: 'Invalid or missing tab' }, 400);
     }
 
-    if (action === 'add') {
-      return addRecord(tab, data.record);
-    } else if (action === 'update') {
-      return updateRecord(tab, data.id, data.updates);
-    } else if (action === 'delete') {
-      return deleteRecord(tab, data.id);
-    } else if (action === 'upsertSetting' && tab === 'Settings') {
-      return upsertSetting(data.key, data.value);
-    }
+    return withScriptLock(function() {
+      if (action === 'add') {
+        return addRecord(tab, data.record);
+      } else if (action === 'update') {
+        return updateRecord(tab, data.id, data.updates);
+      } else if (action === 'delete') {
+        return deleteRecord(tab, data.id);
+      } else if (action === 'upsertSetting' && tab === 'Settings') {
+        return upsertSetting(data.key, data.value);
+      }
 
-    return createResponse({ error: 'Unknown action: ' + action }, 400);
+      return createResponse({ error: 'Unknown action: ' + action }, 400);
+    });
   } catch (error) {
     return createResponse({ error: 'Parse error: ' + error.message }, 500);
   }
 }
 
+// Run a write while holding the script lock. addRecord's duplicate check reads
+// the sheet and then appends, so two overlapping requests (say, a client
+// resend while the first is still running) would otherwise both pass the
+// check and append the same row. Throws if the lock isn't free in time.
+function withScriptLock(fn) {
+  const lock = LockService.getScriptLock();
+  lock.waitLock(WRITE_LOCK_WAIT_MS);
+  try {
+    return fn();
+  } finally {
+    lock.releaseLock();
+  }
+}
+
 // ============ CRUD Operations ============
 
-function addRecord(tab, record) {
-  const sheet = SpreadsheetApp.openById(SHEET_ID).getSheetByName(tab);
+// Apply a list of add/update operations, each shaped like a single doPost body.
+// Results are returned in the same order so the caller can log per-record
+// outcomes; one failing operation doesn't stop the rest. Each tab is opened and
+// read once for the whole request rather than once per operation.
+function runBulkOperations(operations) {
+  const cache = {};
+  const results = operations.map(function(op) {
+    try {
+      if (!op || !op.tab || !TABS[op.tab]) {
+        return { error: 'Invalid or missing tab' };
+      }
+      let output;
+      if (op.action === 'add') {
+        output = addRecord(op.tab, op.record, cache);
+      } else if (op.action === 'update') {
+        output = updateRecord(op.tab, op.id, op.updates, cache);
+      } else {
+        return { error: 'Unsupported bulk action: ' + op.action };
+      }
+      return JSON.parse(output.getContent());
+    } catch (error) {
+      return { error: error.message };
+    }
+  });
+  return { success: true, results: results };
+}
+
+// Sheet handle for a tab, plus its values once tabValues() has read them.
+// With a bulk cache, every operation in the request shares one entry per tab.
+function openTab(tab, cache) {
+  if (cache && cache[tab]) return cache[tab];
+  const entry = { sheet: SpreadsheetApp.openById(SHEET_ID).getSheetByName(tab), values: null };
+  if (cache) cache[tab] = entry;
+  return entry;
+}
+
+function tabValues(entry) {
+  if (!entry.values) entry.values = entry.sheet.getDataRange().getValues();
+  return entry.values;
+}
+
+function addRecord(tab, record, cache) {
+  const entry = openTab(tab, cache);
+  const sheet = entry.sheet;
   if (!sheet) return createResponse({ error: 'Tab not found: ' + tab }, 404);
 
   const headers = TABS[tab];
@@ -180,7 +268,7 @@ function addRecord(tab, record) {
     var newMs = record.submittedAtMs ? parseInt(record.submittedAtMs, 10) : 0;
 
     if (msCol !== -1 && newMs > 0) {
-      var data = sheet.getDataRange().getValues();
+      var data = tabValues(entry);
       for (var i = 1; i < data.length; i++) {
         var rowEmail = userCol !== -1 ? (data[i][userCol] || '').toString().toLowerCase() : '';
         if (newUserEmail && rowEmail && rowEmail !== newUserEmail) continue;
@@ -190,7 +278,7 @@ function addRecord(tab, record) {
         }
       }
     } else if (record.date && dateCol !== -1 && earnCol !== -1) {
-      var data = sheet.getDataRange().getValues();
+      var data = tabValues(entry);
       var newEarnings = parseFloat(record.earnings) || 0;
       var newDate = String(record.date).slice(0, 10);
       var newSubmittedAt = record.submittedAt ? String(record.submittedAt).slice(0, 19) : '';
@@ -214,24 +302,28 @@ function addRecord(tab, record) {
   });
 
   sheet.appendRow(row);
+  // Keep already-read values current so later adds in a bulk request see it
+  if (entry.values) entry.values.push(row);
   return createResponse({ success: true, record: record });
 }
 
-function updateRecord(tab, id, updates) {
-  const sheet = SpreadsheetApp.openById(SHEET_ID).getSheetByName(tab);
+function updateRecord(tab, id, updates, cache) {
+  const entry = openTab(tab, cache);
+  const sheet = entry.sheet;
   if (!sheet) return createResponse({ error: 'Tab not found: ' + tab }, 404);
 
   const headers = TABS[tab];
   const idCol = headers.indexOf('ID');
   if (idCol === -1) return createResponse({ error: 'No ID column in ' + tab }, 400);
 
-  const data = sheet.getDataRange().getValues();
+  const data = tabValues(entry);
   for (let i = 1; i < data.length; i++) {
     if (data[i][idCol] === id) {
       headers.forEach((h, col) => {
         const key = camelCase(h);
         if (updates[key] !== undefined) {
           sheet.getRange(i + 1, col + 1).setValue(updates[key]);
+          data[i][col] = updates[key];
         }
       });
       return createResponse({ success: true });
@@ -1,6 +1,6 @@
 // Configuration for Hours Worked Tracker
 
-const APP_VERSION = '2.0.50';
+const APP_VERSION = '2.1.0';
 
 // Auth roles
 const AUTH_ROLES = {
@@ -9,6 +9,7 @@ Usage:
     python da_payer.py --force        # Request payout regardless of day
     python da_payer.py --auto         # Headless payout for Task Scheduler
     python da_payer.py --profile lisa # Use Lisa's credentials
+    python da_payer.py --refresh-payday  # Re-read payday from Sheets, not the 24h cache
 
 Credentials:
     Create a .env file in the tools/ directory:
@@ -20,13 +21,12 @@ Credentials:
 import sys
 import argparse
 import logging
-from datetime import datetime
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
 
 from da_common import (
     SCRIPT_DIR, DAY_NAMES,
     reload_profile, login_to_da, create_browser_and_page,
     get_payday_from_sheets, get_auto_payout_settings, is_today_payday,
+    today_js_weekday,
 )
 import da_common
 
@@ -35,6 +35,8 @@ log = logging.getLogger("da_payer")
 
 def claim_payment(page):
     """Click the 'Get paid' button on the payments page to request payout."""
+    from playwright.sync_api import TimeoutError as PWTimeout
+
     log.info("[3/3] Looking for 'Get paid' button...")
 
     try:
@@ -78,6 +80,8 @@ def main():
                         help="Unattended mode: headless, check auto-payout setting")
     parser.add_argument("--profile", default="default",
                         help="Profile name: loads .env.<profile> (e.g., --profile lisa)")
+    parser.add_argument("--refresh-payday", action="store_true",
+                        help="Read payday from Sheets even if the cached value is fresh")
     args = parser.parse_args()
 
     if args.profile != 'default':
@@ -95,9 +99,10 @@ def main():
                          "(Enable in app Settings or use --force to override)")
                 sys.exit(0)
 
-        payday = get_payday_from_sheets()
-        if not is_today_payday(payday):
-            log.info(f"Today is {DAY_NAMES[(datetime.now().weekday() + 1) % 7]}, "
+        today_js = today_js_weekday()
+        payday = get_payday_from_sheets(use_cache=not args.refresh_payday)
+        if not is_today_payday(payday, today_js):
+            log.info(f"Today is {DAY_NAMES[today_js]}, "
                      f"payday is {DAY_NAMES[payday]}. Skipping payout. (Use --force to override)")
             sys.exit(0)
         log.info(f"Today is payday ({DAY_NAMES[payday]})! Starting payment claim...")
@@ -108,6 +113,10 @@ def main():
         log.error("Missing credentials! Create a .env file with DA_EMAIL and DA_PASSWORD.")
         sys.exit(1)
 
+    # Playwright is only imported once we know we're paying out; on the
+    # (usual) non-payday run the script exits above without loading it.
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         browser, page = create_browser_and_page(p, headless=args.headless)
 
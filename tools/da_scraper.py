@@ -6,7 +6,7 @@ extracts the HTML, parses entries, and imports them directly
 into Google Sheets via the Apps Script API for automatic reconciliation.
 
 Setup:
-    pip install playwright python-dotenv requests beautifulsoup4
+    pip install playwright python-dotenv requests lxml
     playwright install chromium
 
 Usage:
@@ -15,6 +15,8 @@ Usage:
     python da_scraper.py --no-show-paid  # Unpaid-only scrape
     python da_scraper.py --auto          # Unattended mode (headless, no prompts)
     python da_scraper.py --profile lisa  # Use Lisa's credentials
+    python da_scraper.py --from-backup da_html_exports/da_payments_<ts>.html.gz
+                                         # Re-import a saved backup, no browser
 
 Credentials:
     Create a .env file in the tools/ directory:
@@ -23,20 +25,25 @@ Credentials:
         APPS_SCRIPT_URL=https://script.google.com/macros/s/YOUR_ID/exec
 """
 
+import io
 import os
 import sys
-import json
 import re
 import time
+import gzip
+import hashlib
+import shutil
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from pathlib import Path
 import requests
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+from lxml import etree
+from playwright.sync_api import sync_playwright, Error as PWError, TimeoutError as PWTimeout
 
 from da_common import (
-    SCRIPT_DIR, HTML_OUTPUT_DIR, DA_PAYMENTS_URL,
+    SCRIPT_DIR, HTML_OUTPUT_DIR, LOG_DIR, DA_PAYMENTS_URL,
     DA_EMAIL, DA_PASSWORD, APPS_SCRIPT_URL, DA_USER_EMAIL,
     reload_profile, login_to_da, create_browser_and_page, log,
 )
@@ -49,6 +56,133 @@ log = logging.getLogger("da_scraper")
 # retroactively annotate historical rows.
 STATUS_TRACKING_CUTOFF = datetime(2026, 5, 1, tzinfo=timezone.utc)
 
+# Row parsing patterns (parse_da_html)
+AMOUNT_NOISE_CHARS = str.maketrans('', '', '$,')
+BONUS_TITLE_PATTERN = re.compile(r'(?i)submission\s+bonus|bonus\s+survey')
+HOURS_PATTERN = re.compile(r'(\d+)\s*h')
+MINUTES_PATTERN = re.compile(r'(\d+)\s*min')
+
+# A bulk import can carry dozens of writes, each of which Apps Script applies
+# in turn, so it gets far more time than a single-record request: longer than
+# Apps Script's 6-minute execution limit, so a slow run is never cut off (and
+# left running server-side) by our own timeout.
+BULK_IMPORT_TIMEOUT = 390
+
+# Operations per bulk request. A first run with the whole paid history can
+# have hundreds; splitting them keeps each Apps Script execution far from its
+# time limit.
+BULK_BATCH_SIZE = 100
+
+# Most distinct amounts sent in the sessions query string. Past this the list
+# is left out (sinceMs alone still narrows the response) so the GET URL stays
+# well within Google's length limits on a full-history scrape.
+MAX_FILTER_AMOUNTS = 100
+
+# Concurrent per-record POSTs when the bulk action isn't available. Kept small
+# so we stay well under Apps Script's simultaneous-execution limit.
+IMPORT_WORKERS = 8
+
+# Scraped rows are bare <tr> markup; parsers and the backup get them inside
+# this. Bytes, since each page is UTF-8 encoded once and used as bytes after.
+TABLE_HTML_HEAD = b"<html><body><table><tbody>\n"
+TABLE_HTML_TAIL = b"</tbody></table></body></html>"
+
+# Funds History tab: DA's id, with a text-based fallback in the same locator
+FUNDS_HISTORY_TAB_SELECTOR = '#fundsHistory-tab, button[role="tab"]:has-text("Funds History")'
+FUNDS_HISTORY_TAB_SELECTED_SELECTOR = (
+    '#fundsHistory-tab[aria-selected="true"], '
+    'button[role="tab"][aria-selected="true"]:has-text("Funds History")'
+)
+
+# Id of the first payment row; changes when pagination swaps the table body
+FIRST_ROW_ID_JS = """() => {
+    const row = document.querySelector('tr[id^="row-"]');
+    return row ? row.id : '';
+}"""
+
+# Ids of every payment row, in order; changes when a filter re-renders the table
+ROW_IDS_JS = """() => Array.from(document.querySelectorAll('tr[id^="row-"]'), row => row.id).join(',')"""
+
+# 'Include paid' filter button, and a fingerprint of its toggle state
+INCLUDE_PAID_BUTTON_JS = """() => Array.from(document.querySelectorAll('button'))
+    .find(btn => btn.textContent.trim().toLowerCase() === 'include paid')"""
+INCLUDE_PAID_STATE_JS = f"""() => {{
+    const btn = ({INCLUDE_PAID_BUTTON_JS})();
+    return btn ? [btn.className, btn.getAttribute('aria-pressed'), btn.getAttribute('data-state')].join('|') : null;
+}}"""
+# How long the table gets to re-render after 'Include paid' is clicked
+INCLUDE_PAID_RENDER_MS = 10000
+
+# Row expansion runs in-page until no new arrows appear for EXPAND_SETTLE_MS,
+# capped at EXPAND_MAX_MS in case DA keeps mutating the table.
+EXPAND_SETTLE_MS = 500
+EXPAND_MAX_MS = 20000
+EXPAND_ALL_ROWS_JS = """({ settleMs, maxMs }) => new Promise(resolve => {
+    let total = 0;
+    let rounds = 0;
+    let settleTimer = null;
+    let hardStop = null;
+    let observer = null;
+    // Nested rows are inserted into the payments table, so only its subtree
+    // is scanned and watched.
+    const root = document.querySelector('table') || document.body;
+
+    const clickCollapsed = () => {
+        let clicked = 0;
+        // Collapsed arrows are rotated a quarter turn; the attribute selector
+        // lets the browser's selector engine do the style matching.
+        const collapsed = root.querySelectorAll(
+            'svg.tw-rounded-full[style*="rotate(-0.25turn)"]:not([data-expanded="1"])'
+        );
+        for (const svg of collapsed) {
+            svg.dataset.expanded = '1';
+            svg.parentElement.click();
+            clicked++;
+        }
+        return clicked;
+    };
+    const record = (clicked) => {
+        if (clicked > 0) {
+            total += clicked;
+            rounds++;
+        }
+        return clicked;
+    };
+    const finish = (timedOut) => {
+        observer.disconnect();
+        clearTimeout(settleTimer);
+        clearTimeout(hardStop);
+        resolve({ total, rounds, timedOut });
+    };
+    // Done once the table has been quiet for settleMs and a final sweep
+    // finds nothing left to click.
+    const settle = () => {
+        if (record(clickCollapsed()) === 0) {
+            finish(false);
+            return;
+        }
+        schedule();
+    };
+    const schedule = () => {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(settle, settleMs);
+    };
+
+    // Arrows that arrive with a mutation are clicked straight away instead
+    // of waiting out the settle period.
+    observer = new MutationObserver(() => {
+        record(clickCollapsed());
+        schedule();
+    });
+    observer.observe(root, { childList: true, subtree: true });
+    hardStop = setTimeout(() => finish(true), maxMs);
+    if (record(clickCollapsed()) === 0) {
+        finish(false);
+        return;
+    }
+    schedule();
+})"""
+
 
 def should_track_status(submitted_at_iso):
     """True when a DA entry's submission time is on/after the cutoff."""
@@ -63,35 +197,105 @@ def should_track_status(submitted_at_iso):
     return dt >= STATUS_TRACKING_CUTOFF
 
 
+def _wait_quietly(locator, timeout_ms):
+    """Wait for a locator to become visible, treating a timeout as non-fatal.
+
+    Used in place of fixed sleeps after clicks: returns as soon as the UI has
+    reacted, and never waits longer than the old sleep-based worst case.
+    """
+    try:
+        locator.wait_for(state="visible", timeout=timeout_ms)
+    except PWTimeout:
+        pass
+
+
+def wait_for_dom(page, predicate_js, arg=None, timeout_ms=10000):
+    """Wait until the JS function `predicate_js` returns truthy for `arg`.
+
+    Like page.wait_for_function, but the predicate is re-checked from a
+    MutationObserver the moment the DOM changes instead of on a polling
+    schedule. Raises PWTimeout if it doesn't hold within timeout_ms. Like
+    wait_for_function it survives navigations: if one destroys the page's JS
+    context mid-wait, the wait resumes in the new document until the same
+    deadline.
+    """
+    deadline = time.monotonic() + timeout_ms / 1000
+    while True:
+        remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+        try:
+            satisfied = page.evaluate(f"""([arg, timeoutMs]) => new Promise(resolve => {{
+                const predicate = {predicate_js};
+                if (predicate(arg)) return resolve(true);
+                let timer = null;
+                const observer = new MutationObserver(() => {{
+                    if (predicate(arg)) {{
+                        observer.disconnect();
+                        clearTimeout(timer);
+                        resolve(true);
+                    }}
+                }});
+                observer.observe(document, {{ childList: true, subtree: true, attributes: true, characterData: true }});
+                timer = setTimeout(() => {{
+                    observer.disconnect();
+                    resolve(false);
+                }}, timeoutMs);
+            }})""", [arg, remaining_ms])
+            break
+        except PWError as e:
+            if "Execution context was destroyed" not in str(e):
+                raise
+            if time.monotonic() >= deadline:
+                raise PWTimeout(f"Timeout {timeout_ms}ms exceeded waiting for DOM condition") from e
+            page.wait_for_load_state(
+                "domcontentloaded",
+                timeout=max(1, int((deadline - time.monotonic()) * 1000)),
+            )
+    if not satisfied:
+        raise PWTimeout(f"Timeout {timeout_ms}ms exceeded waiting for DOM condition")
+
+
+def _is_da_data_response(response):
+    """True for XHR/fetch responses from DA's /workers/ routes."""
+    return (response.request.resource_type in ("xhr", "fetch")
+            and "/workers/" in response.url)
+
+
+def _click_and_wait_for_data(page, click, timeout_ms):
+    """Run `click` and return once the DA data request it triggers has landed.
+
+    Bounded by timeout_ms, so a filter that turns out to be purely client-side
+    costs no more than the fixed sleep this replaces. Returns click()'s result.
+    """
+    result = None
+    try:
+        with page.expect_response(_is_da_data_response, timeout=timeout_ms):
+            result = click()
+    except PWTimeout:
+        pass
+    return result
+
+
 def _try_click_funds_history_tab(page, timeout_ms):
     """Single attempt to find and click the Funds History tab.
 
+    The id selector and the text fallback are one combined locator, so
+    whichever form DA renders is matched in a single wait rather than timing
+    out on one selector before trying the next.
+
     Returns True if the tab was found (and clicked if needed), False otherwise.
     """
     try:
-        tab = page.locator('#fundsHistory-tab').first
+        tab = page.locator(FUNDS_HISTORY_TAB_SELECTOR).first
         tab.wait_for(state="visible", timeout=timeout_ms)
         if tab.get_attribute('aria-selected') != 'true':
             tab.click()
-            page.wait_for_timeout(1000)
+            _wait_quietly(page.locator(FUNDS_HISTORY_TAB_SELECTED_SELECTOR).first, 1000)
             log.info("  -> 'Funds History' tab selected.")
         else:
             log.info("  -> 'Funds History' tab already active.")
         return True
     except Exception:
-        pass
-
-    try:
-        tab = page.locator('button[role="tab"]', has_text="Funds History").first
-        if tab.is_visible(timeout=2000):
-            tab.click()
-            page.wait_for_timeout(1000)
-            log.info("  -> 'Funds History' tab selected (text fallback).")
-            return True
-    except Exception:
-        pass
-
-    return False
+        return False
 
 
 def ensure_funds_history_tab(page):
@@ -109,7 +313,6 @@ def ensure_funds_history_tab(page):
     log.info("  -> Tab not found on first attempt; reloading and retrying...")
     try:
         page.reload(wait_until='domcontentloaded', timeout=30000)
-        page.wait_for_timeout(2000)
     except Exception as e:
         log.info(f"  -> Reload errored ({e}); retrying tab lookup anyway.")
 
@@ -128,9 +331,10 @@ def _try_wait_for_table(page, timeout_ms):
     # tr[id^="row-"] entries — so when the account has a single unpaid entry the
     # old "tr.length > 1" guard never passed and the scrape timed out. This also
     # matches exactly what parse_da_html() extracts (tr[id^="row-"]).
-    page.wait_for_function(
+    wait_for_dom(
+        page,
         """() => document.querySelectorAll('tr[id^="row-"]').length > 0""",
-        timeout=timeout_ms,
+        timeout_ms=timeout_ms,
     )
 
 
@@ -167,33 +371,58 @@ def wait_for_payments_table(page, timeout_ms=30000, retries=1):
 
 
 def toggle_show_paid(page, enable=False):
-    """Toggle the 'Include paid' filter button (DA redesigned from checkbox to button)."""
+    """Toggle the 'Include paid' filter button (DA redesigned from checkbox to button).
+
+    Returns once the table has re-rendered with the filter applied. A button
+    that exists isn't necessarily wired up yet, so if neither the table nor
+    the button reacts to the click, it is clicked once more.
+    """
     if not enable:
         return
     log.info("  -> Enabling 'Include paid' filter...")
-    # Wait for React to hydrate the Funds History table
-    page.wait_for_timeout(5000)
+    # Wait for React to render the filter button itself rather than a fixed 5s
+    try:
+        wait_for_dom(page, f"() => !!({INCLUDE_PAID_BUTTON_JS})()", timeout_ms=5000)
+    except PWTimeout:
+        log.info("  -> 'Include paid' button not rendered after 5s; trying anyway.")
+
     # Use JS to find and click — Playwright selectors struggle with React-rendered buttons
-    clicked = page.evaluate("""() => {
-        const buttons = document.querySelectorAll('button');
-        for (const btn of buttons) {
-            if (btn.textContent.trim().toLowerCase() === 'include paid') {
-                btn.click();
-                return true;
-            }
-        }
-        return false;
-    }""")
-    if clicked:
-        page.wait_for_timeout(3000)
-        log.info("  -> 'Include paid' toggled on.")
-        return
+    def click_include_paid():
+        return page.evaluate(f"""() => {{
+            const btn = ({INCLUDE_PAID_BUTTON_JS})();
+            if (!btn) return false;
+            btn.click();
+            return true;
+        }}""")
+
+    for attempt in (1, 2):
+        rows_before = page.evaluate(ROW_IDS_JS)
+        button_before = page.evaluate(INCLUDE_PAID_STATE_JS)
+        if not click_include_paid():
+            break
+        try:
+            wait_for_dom(page, f"prev => ({ROW_IDS_JS})() !== prev",
+                         arg=rows_before, timeout_ms=INCLUDE_PAID_RENDER_MS)
+            log.info("  -> 'Include paid' toggled on.")
+            return
+        except PWTimeout:
+            pass
+        if page.evaluate(INCLUDE_PAID_STATE_JS) != button_before:
+            # The click registered; this page just looks the same with paid rows.
+            log.warning(f"  -> 'Include paid' is on but the table didn't change within "
+                        f"{INCLUDE_PAID_RENDER_MS // 1000}s; continuing.")
+            return
+        if attempt == 1:
+            log.warning("  -> Neither the table nor the button reacted to 'Include paid'; clicking again...")
+        else:
+            log.warning("  -> 'Include paid' still had no visible effect; paid rows may be missing.")
+            return
+
     # Fallback: old checkbox UI
     try:
         checkbox = page.locator('input[type="checkbox"]').first
         if checkbox.is_visible(timeout=2000) and not checkbox.is_checked():
-            checkbox.click()
-            page.wait_for_timeout(2000)
+            _click_and_wait_for_data(page, checkbox.click, 2000)
             log.info("  -> 'Show paid' checkbox enabled (legacy UI).")
             return
     except Exception:
@@ -202,43 +431,31 @@ def toggle_show_paid(page, enable=False):
 
 
 def expand_all_rows(page):
-    """Click all collapsed expand arrows to reveal nested rows."""
-    log.info("[4/6] Expanding all nested rows...")
-    total_expanded = 0
-    max_rounds = 20
-
-    for round_num in range(max_rounds):
-        result = page.evaluate("""() => {
-            const svgs = document.querySelectorAll('svg.tw-rounded-full');
-            let clicked = 0;
-            for (const svg of svgs) {
-                if (svg.dataset.expanded === '1') continue;
-                const style = svg.getAttribute('style') || '';
-                if (style.includes('rotate(-0.25turn)')) {
-                    svg.dataset.expanded = '1';
-                    svg.parentElement.click();
-                    clicked++;
-                }
-            }
-            return { clicked };
-        }""")
-
-        clicked = result["clicked"]
-        total_expanded += clicked
-
-        if clicked == 0:
-            log.info(f"  -> Round {round_num + 1}: no more collapsed rows found")
-            break
-
-        log.info(f"  -> Round {round_num + 1}: expanded {clicked} rows")
-        page.wait_for_timeout(800)
-
-    log.info(f"  -> Total expansions: {total_expanded}")
-    return total_expanded
+    """Click all collapsed expand arrows to reveal nested rows.
 
-
-def scrape_all_pages(page, show_paid=False):
-    """Expand all rows on every page, handling pagination via the 'Next' button."""
+    The whole expansion runs inside one page.evaluate: a MutationObserver on
+    the table clicks new arrows as soon as nested rows render, and the promise
+    resolves once the table has been quiet for EXPAND_SETTLE_MS with nothing
+    left to click.
+    """
+    log.info("[4/6] Expanding all nested rows...")
+    result = page.evaluate(EXPAND_ALL_ROWS_JS, {
+        "settleMs": EXPAND_SETTLE_MS,
+        "maxMs": EXPAND_MAX_MS,
+    })
+    if result["timedOut"]:
+        log.warning(f"  -> Expansion still active after {EXPAND_MAX_MS}ms; continuing with what rendered.")
+    log.info(f"  -> Total expansions: {result['total']} in {result['rounds']} round(s)")
+    return result["total"]
+
+
+def scrape_all_pages(page, on_page, show_paid=False):
+    """Expand all rows on every page, handling pagination via the 'Next' button.
+
+    `on_page` is called with each page's row markup as soon as it's extracted,
+    before moving on to the next page; nothing is kept here, so memory doesn't
+    grow with the number of pages. Returns the number of pages scraped.
+    """
     # The payments page is a tabbed UI; the <table> only renders inside the
     # Funds History panel. We must click that tab BEFORE waiting on the table,
     # otherwise wait_for_payments_table times out on the default tab where no
@@ -247,25 +464,40 @@ def scrape_all_pages(page, show_paid=False):
     wait_for_payments_table(page)
     toggle_show_paid(page, enable=show_paid)
 
-    all_html_parts = []
     page_num = 1
 
     while True:
         log.info(f"\n--- Page {page_num} ---")
         expand_all_rows(page)
 
-        table_html = page.evaluate("""() => {
+        # Only the rows are shipped back over CDP; the consumer supplies the
+        # <table> wrapper. Every <tbody> of the table is included, in case DA
+        # splits the rows across several.
+        rows_html = page.evaluate("""() => {
             const table = document.querySelector('table');
-            return table ? table.outerHTML : '';
+            if (!table) return '';
+            return table.tBodies.length
+                ? Array.from(table.tBodies, body => body.innerHTML).join('\\n')
+                : table.innerHTML;
         }""")
-        if table_html:
-            all_html_parts.append(table_html)
+        if rows_html:
+            on_page(rows_html)
 
         try:
             next_btn = page.locator('button:has-text("Next")').first
             if next_btn.is_visible(timeout=2000) and next_btn.is_enabled():
+                first_row_id = page.evaluate(FIRST_ROW_ID_JS)
                 next_btn.click()
-                page.wait_for_timeout(2000)
+                # The next page has rendered once the first row's id changes
+                try:
+                    wait_for_dom(
+                        page,
+                        f"prev => ({FIRST_ROW_ID_JS})() !== prev",
+                        arg=first_row_id,
+                        timeout_ms=10000,
+                    )
+                except PWTimeout:
+                    log.warning("  -> Table did not change after 'Next' within 10s; scraping as-is.")
                 page_num += 1
             else:
                 break
@@ -273,87 +505,234 @@ def scrape_all_pages(page, show_paid=False):
             break
 
     log.info(f"\n  -> Scraped {page_num} page(s) total")
-    return all_html_parts
+    return page_num
+
+
+def wrap_rows_html(rows_html):
+    """Wrap bare <tr> markup (UTF-8 bytes) in a table so parsers keep the rows intact."""
+    return TABLE_HTML_HEAD + rows_html + TABLE_HTML_TAIL
+
+
+class HtmlBackup:
+    """Timestamped backup of a scrape, written one page at a time.
+
+    The file holds every page's rows in one table (each preceded by a
+    "<!-- Page N -->" marker), appended as the pages go by so the whole
+    scrape is never held as one string. With
+    compress=True it is gzipped (.html.gz) as it is written; --html-only keeps
+    plain .html since that mode exists to open the file. Pages go to a
+    temporary name that finish() renames into place, so an interrupted run
+    never leaves a truncated backup behind.
+    """
+
+    def __init__(self, compress=False):
+        HTML_OUTPUT_DIR.mkdir(exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        self.path = HTML_OUTPUT_DIR / f"da_payments_{timestamp}.html{'.gz' if compress else ''}"
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._file = (gzip.open(self._tmp_path, "wb", compresslevel=6) if compress
+                      else self._tmp_path.open("wb"))
+        self._pages = 0
+        self._write(TABLE_HTML_HEAD)
+
+    def _write(self, data):
+        self._file.write(data)
+
+    def add_page(self, rows_html):
+        """Append one page's row markup, given as UTF-8 bytes."""
+        self._pages += 1
+        self._write(f"<!-- Page {self._pages} -->\n".encode("utf-8"))
+        self._write(rows_html)
+        self._write(b"\n")
+
+    def finish(self):
+        """Close the backup and move it into place; returns its path."""
+        self._write(TABLE_HTML_TAIL)
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        log.info(f"  -> Saved to {self.path}")
+        compress_old_backups()
+        return self.path
+
+    def discard(self):
+        """Drop a backup that won't be finished (the scrape failed)."""
+        self._file.close()
+        try:
+            self._tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def compress_old_backups(max_age_days=1):
+    """Gzip plain .html backups older than max_age_days (DA HTML shrinks 10-20x)."""
+    cutoff = time.time() - max_age_days * 24 * 60 * 60
+    for path in HTML_OUTPUT_DIR.glob("da_payments_*.html"):
+        try:
+            if path.stat().st_mtime >= cutoff:
+                continue
+            gz_path = path.with_name(path.name + ".gz")
+            tmp_path = gz_path.with_name(gz_path.name + ".tmp")
+            with path.open("rb") as src, gzip.open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp_path, gz_path)
+            path.unlink()
+        except OSError as e:
+            log.warning(f"  -> Could not compress old backup {path.name}: {e}")
+
+
+def load_html_backup(path):
+    """Read a saved backup as UTF-8 bytes for parse_da_html, gunzipping .html.gz files."""
+    path = Path(path)
+    data = path.read_bytes()
+    if path.suffix == '.gz':
+        data = gzip.decompress(data)
+    return data
+
+
+def _iter_payment_rows(html):
+    """Yield each payment <tr> as soon as it has been parsed, then free it.
+
+    Rows are streamed with iterparse instead of building the whole tree first;
+    once the caller is done with a row it is cleared and dropped from its
+    parent, so memory stays bounded by a single row.
+    """
+    data = html.encode('utf-8') if isinstance(html, str) else html
+    rows = etree.iterparse(io.BytesIO(data), events=('end',), tag='tr', html=True, encoding='utf-8')
+    try:
+        for _, row in rows:
+            if row.get('id', '').startswith('row-'):
+                yield row
+            row.clear()
+            parent = row.getparent()
+            if parent is not None:
+                while row.getprevious() is not None:
+                    del parent[0]
+    except etree.XMLSyntaxError:
+        # Raised for empty input (or one with no elements at all), e.g. an
+        # empty backup; whatever rows came before it have been yielded.
+        return
+
+
+def _has_class(*classes):
+    """XPath predicate matching elements that carry every given class token."""
+    return ' and '.join(f'contains(concat(" ", normalize-space(@class), " "), " {c} ")' for c in classes)
+
 
+def _first(elements):
+    """First match of an XPath result, or None."""
+    return elements[0] if elements else None
 
-def combine_html_pages(html_parts):
-    """Wrap multiple table pages into one HTML doc."""
-    if len(html_parts) == 1:
-        return f"<html><body>{html_parts[0]}</body></html>"
 
-    combined = "<html><body>\n"
-    for i, part in enumerate(html_parts):
-        combined += f"<!-- Page {i + 1} -->\n{part}\n"
-    combined += "</body></html>"
-    return combined
+def _text(el, sep=''):
+    """An element's text, each piece stripped and empty pieces dropped, joined by sep."""
+    return sep.join(t for t in (t.strip() for t in el.itertext()) if t)
 
 
-def save_html_to_file(html):
-    """Save HTML to a timestamped file for backup."""
-    HTML_OUTPUT_DIR.mkdir(exist_ok=True)
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-    filepath = HTML_OUTPUT_DIR / f"da_payments_{timestamp}.html"
-    filepath.write_text(html, encoding="utf-8")
-    log.info(f"  -> Saved to {filepath}")
-    return filepath
+def _sibling_element(el, forward=True):
+    """Nearest element sibling, skipping comments (which lxml exposes as nodes)."""
+    sibling = el.getnext() if forward else el.getprevious()
+    while sibling is not None and not isinstance(sibling.tag, str):
+        sibling = sibling.getnext() if forward else sibling.getprevious()
+    return sibling
 
 
-def parse_da_html(html):
+# Row lookups for parse_da_html, compiled once rather than on every row
+TITLE_CELL_XPATH = etree.XPath('.//*[@data-column-id="title"]')
+TITLE_SPAN_XPATH = etree.XPath('.//*[@data-column-id="title"]//span')
+REFERRAL_BADGE_XPATH = etree.XPath(f'.//*[{_has_class("tw-bg-blue-600")}]')
+AMOUNT_CELL_XPATH = etree.XPath('.//*[@data-column-id="amount"]')
+AMOUNT_BOLD_XPATH = etree.XPath(f'.//*[{_has_class("tw-font-semibold")}]')
+AMOUNT_SMALL_XPATH = etree.XPath(f'.//*[{_has_class("tw-text-sm", "tw-text-black-80")}]')
+AMOUNT_DIV_XPATH = etree.XPath('./div')
+TIME_CELL_XPATH = etree.XPath('.//*[@data-column-id="time"]/div')
+DURATION_XPATH = etree.XPath(f'.//*[{_has_class("tw-text-sm", "tw-text-black-60")}]')
+TIME_AGO_XPATH = etree.XPath('.//*[@data-column-id="timeAgo"]//time[@datetime]')
+ANY_TIME_XPATH = etree.XPath('.//time[@datetime]')
+
+
+def parse_da_html(html, state=None):
     """Parse DA payments HTML and extract work entries.
 
     Returns a list of dicts with: type, amount, duration, submittedAt, projectName
+
+    `html` may be str or UTF-8 bytes. Pages can be parsed one at a time by
+    passing the same `state` dict to each call in page order: it carries the
+    current project header across the page break, since a project's rows can
+    continue onto the next page.
     """
-    soup = BeautifulSoup(html, 'html.parser')
-    rows = soup.select('tr[id^="row-"]')
+    rows = _iter_payment_rows(html)
     entries = []
-    current_project = None
-    is_bonus_project = False
+    if state is None:
+        state = {}
+    current_project = state.get('project')
+    is_bonus_project = state.get('is_bonus', False)
 
     for row in rows:
-        row_class = row.get('class', [])
-        row_class_str = ' '.join(row_class) if isinstance(row_class, list) else str(row_class)
+        row_class_str = row.get('class', '')
         is_date_row = 'tw-bg-[#E5D3EB]' in row_class_str or 'tw-border-primary-light-50' in row_class_str
 
         # Check indent level to distinguish headers vs sub-items
-        title_td = row.select_one('[data-column-id="title"]')
-        title_div = None
+        title_td = _first(TITLE_CELL_XPATH(row))
         title_div_class = ''
-        if title_td:
-            for d in title_td.select('div'):
-                if any(c.startswith('tw-ml-') for c in d.get('class', [])):
-                    title_div = d
-                    title_div_class = ' '.join(d.get('class', []))
+        if title_td is not None:
+            for d in title_td.iterdescendants('div'):
+                classes = d.get('class', '').split()
+                if any(c.startswith('tw-ml-') for c in classes):
+                    title_div_class = ' '.join(classes)
                     break
         is_sub_item = 'tw-ml-10' in title_div_class
         is_top_level = 'tw-ml-0' in title_div_class and not is_sub_item
 
+        # Date rows are purple bg AND tw-ml-0 (top-level)
+        if is_date_row and is_top_level:
+            current_project = None
+            is_bonus_project = False
+            continue
+
         # Get title text
-        title_span = row.select_one('[data-column-id="title"] span')
-        title = title_span.get_text(strip=True) if title_span else ''
+        title_span = _first(TITLE_SPAN_XPATH(row))
+        title = _text(title_span) if title_span is not None else ''
+
+        # Detect referral badge (blue badge with "referral" text)
+        referral_badge = _first(REFERRAL_BADGE_XPATH(row))
+        is_referral = referral_badge is not None and _text(referral_badge).lower() == 'referral'
+
+        # Header and divider rows are settled by their title and indent alone,
+        # so skip them before any of the amount/time/status lookups below.
+        if not is_referral:
+            # Project name headers
+            is_project_header = (is_top_level or 'tw-ml-5' in title_div_class) and not is_sub_item
+            if is_project_header and title not in ('Task Submission', 'Time Entry'):
+                current_project = title
+                is_bonus_project = bool(BONUS_TITLE_PATTERN.search(title))
+                continue
+            if not is_sub_item or title not in ('Time Entry', 'Task Submission'):
+                continue
 
         # Get amount
-        amount_td = row.select_one('[data-column-id="amount"]')
+        amount_td = _first(AMOUNT_CELL_XPATH(row))
         amount = 0.0
-        if amount_td:
-            amount_el = (amount_td.select_one('.tw-font-semibold')
-                         or amount_td.select_one('.tw-text-sm.tw-text-black-80'))
-            if amount_el:
-                amount_text = amount_el.get_text(strip=True)
+        if amount_td is not None:
+            amount_el = _first(AMOUNT_BOLD_XPATH(amount_td))
+            if amount_el is None:
+                amount_el = _first(AMOUNT_SMALL_XPATH(amount_td))
+            if amount_el is not None:
+                amount_text = _text(amount_el)
             else:
-                amount_cell = amount_td.select_one(':scope > div')
-                amount_text = amount_cell.get_text(strip=True) if amount_cell else ''
+                amount_cell = _first(AMOUNT_DIV_XPATH(amount_td))
+                amount_text = _text(amount_cell) if amount_cell is not None else ''
             try:
-                amount = float(re.sub(r'[$,]', '', amount_text))
+                amount = float(amount_text.translate(AMOUNT_NOISE_CHARS))
             except (ValueError, TypeError):
                 amount = 0.0
 
         # Get time/duration text
-        time_cell = row.select_one('[data-column-id="time"] > div')
-        if time_cell:
-            time_text = time_cell.get_text(strip=True)
+        time_cell = _first(TIME_CELL_XPATH(row))
+        if time_cell is not None:
+            time_text = _text(time_cell)
         else:
-            duration_el = amount_td.select_one('.tw-text-sm.tw-text-black-60') if amount_td else None
-            time_text = duration_el.get_text(strip=True) if duration_el else ''
+            duration_el = _first(DURATION_XPATH(amount_td)) if amount_td is not None else None
+            time_text = _text(duration_el) if duration_el is not None else ''
 
         # DA renders "<state> · <time>X ago</time>" where the state is one of
         # "Pending Approval", "Transferrable in N days" (shared batch marker),
@@ -362,17 +741,17 @@ def parse_da_html(html):
         # sep's next sibling, status text is the prev sibling's text.
         submitted_ms = None
         da_status = ''
-        for sep in row.select('span'):
-            if sep.get_text(strip=True) != '·':
+        for sep in row.iter('span'):
+            if _text(sep) != '·':
                 continue
-            nxt = sep.find_next_sibling()
-            if nxt and nxt.name == 'time' and nxt.get('datetime'):
+            nxt = _sibling_element(sep, forward=True)
+            if nxt is not None and nxt.tag == 'time' and nxt.get('datetime'):
                 try:
-                    submitted_ms = int(nxt['datetime'])
+                    submitted_ms = int(nxt.get('datetime'))
                 except (ValueError, TypeError):
                     submitted_ms = None
-                prev = sep.find_previous_sibling()
-                status_text = prev.get_text(' ', strip=True).lower() if prev else ''
+                prev = _sibling_element(sep, forward=False)
+                status_text = _text(prev, ' ').lower() if prev is not None else ''
                 if 'paid' in status_text:
                     da_status = 'paid'
                 elif 'pending approval' in status_text:
@@ -385,26 +764,18 @@ def parse_da_html(html):
                 break
         # Fallback for the legacy single-<time> shape (no "·" separator).
         if submitted_ms is None:
-            time_el = row.select_one('[data-column-id="timeAgo"] time[datetime]')
-            if not time_el and amount_td:
-                time_el = amount_td.select_one('time[datetime]')
-            if time_el and time_el.get('datetime'):
+            time_el = _first(TIME_AGO_XPATH(row))
+            if time_el is None and amount_td is not None:
+                time_el = _first(ANY_TIME_XPATH(amount_td))
+            if time_el is not None and time_el.get('datetime'):
                 try:
-                    ts = int(time_el['datetime'])
+                    ts = int(time_el.get('datetime'))
                     if ts <= int(datetime.now(tz=timezone.utc).timestamp() * 1000):
                         submitted_ms = ts
                 except (ValueError, TypeError):
                     pass
 
-        # Date rows are purple bg AND tw-ml-0 (top-level)
-        if is_date_row and is_top_level:
-            current_project = None
-            is_bonus_project = False
-            continue
-
-        # Detect referral badge (blue badge with "referral" text)
-        referral_badge = row.select_one('.tw-bg-blue-600')
-        if referral_badge and referral_badge.get_text(strip=True).lower() == 'referral':
+        if is_referral:
             if amount > 0:
                 # Use DA's timestamp if it's in the past (actual submission date),
                 # otherwise fall back to current time
@@ -426,21 +797,11 @@ def parse_da_html(html):
                 })
             continue
 
-        # Project name headers
-        is_project_header = (is_top_level or 'tw-ml-5' in title_div_class) and not is_sub_item
-        if is_project_header and title not in ('Task Submission', 'Time Entry'):
-            current_project = title
-            is_bonus_project = bool(re.search(r'(?i)submission\s+bonus|bonus\s+survey', title))
-            continue
-
-        if not is_sub_item:
-            continue
-
         # Parse sub-items
         if title == 'Time Entry' and amount > 0 and submitted_ms:
             duration = 0.0
-            h_match = re.search(r'(\d+)\s*h', time_text)
-            m_match = re.search(r'(\d+)\s*min', time_text)
+            h_match = HOURS_PATTERN.search(time_text)
+            m_match = MINUTES_PATTERN.search(time_text)
             if h_match:
                 duration += int(h_match.group(1))
             if m_match:
@@ -472,21 +833,75 @@ def parse_da_html(html):
                 'daStatus': da_status,
             })
 
+    state['project'] = current_project
+    state['is_bonus'] = is_bonus_project
     log.info(f"  -> Parsed {len(entries)} DA entries from HTML")
     return entries
 
 
-def fetch_existing_sessions():
-    """Fetch existing work sessions from Google Sheets via Apps Script."""
+def _as_utc(dt):
+    """Treat naive datetimes as UTC so they compare with aware ones."""
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _session_datetime(session):
+    """A session's submittedAt (or, failing that, its date) as a UTC-aware datetime, or None."""
+    for field in ('submittedAt', 'date'):
+        value = session.get(field)
+        if value:
+            try:
+                return _as_utc(datetime.fromisoformat(value))
+            except ValueError:
+                pass
+    return None
+
+
+def _get_sessions(params):
+    """GET the WorkSessions tab; raises if Apps Script doesn't return records."""
+    url = da_common.APPS_SCRIPT_URL + '?tab=WorkSessions'
+    response = da_common.request_with_backoff('GET', url, params=params, timeout=30, allow_redirects=True)
+    data = da_common.response_json(response)
+    if not isinstance(data.get('records'), list):
+        raise ValueError(data.get('error', 'response has no records'))
+    return data['records']
+
+
+def fetch_existing_sessions(da_entries=None):
+    """Fetch existing work sessions from Google Sheets via Apps Script.
+
+    With `da_entries`, Apps Script only returns the sessions reconciliation
+    could match against them: a submittedAtMs no older than the oldest entry,
+    or none at all (legacy sessions), those narrowed to the entries' amounts
+    when there are at most MAX_FILTER_AMOUNTS of them. Deployments without
+    that filter ignore the parameters and return everything, which is still
+    correct. If the filtered request fails it is retried once unfiltered.
+
+    Each record gets a `_dt` key: its submittedAt/date parsed once to a
+    UTC-aware datetime (or None), for reconcile_da_entries' legacy matching.
+    """
     if not da_common.APPS_SCRIPT_URL:
         log.error("APPS_SCRIPT_URL not set in .env — cannot fetch sessions.")
         return None
 
+    params = {}
+    if da_entries:
+        amounts = {f"{e['amount']:.2f}" for e in da_entries}
+        if len(amounts) <= MAX_FILTER_AMOUNTS:
+            params['amounts'] = ','.join(sorted(amounts))
+        entry_ms = [e['submittedAtMs'] for e in da_entries if e.get('submittedAtMs')]
+        if entry_ms:
+            params['sinceMs'] = min(entry_ms)
+
     try:
-        url = da_common.APPS_SCRIPT_URL + '?tab=WorkSessions'
-        response = requests.get(url, timeout=30, allow_redirects=True)
-        data = response.json()
-        records = data.get('records', [])
+        try:
+            records = _get_sessions(params)
+        except Exception as e:
+            if not params:
+                raise
+            log.warning(f"  -> Filtered session fetch failed ({e}); retrying unfiltered.")
+            records = _get_sessions({})
+        for r in records:
+            r['_dt'] = _session_datetime(r)
         log.info(f"  -> Fetched {len(records)} existing work sessions from Sheets")
         return records
     except Exception as e:
@@ -511,8 +926,10 @@ def reconcile_da_entries(da_entries, sessions):
     unmatched = []
     used_session_ids = set()
 
+    # Legacy sessions are bucketed by (type, earnings) with their timestamp
+    # parsed once, so each DA entry only scans sessions it could match.
     by_ms = {}
-    legacy_sessions = []
+    legacy_buckets = {}
     for s in sessions:
         try:
             ms = int(s.get('submittedAtMs') or 0)
@@ -520,8 +937,15 @@ def reconcile_da_entries(da_entries, sessions):
             ms = 0
         if ms > 0:
             by_ms[ms] = s
-        else:
-            legacy_sessions.append(s)
+            continue
+        try:
+            s_earnings = round(float(s.get('earnings', 0)), 2)
+        except (ValueError, TypeError):
+            continue
+        session_dt = s['_dt'] if '_dt' in s else _session_datetime(s)
+        if session_dt is None:
+            continue
+        legacy_buckets.setdefault((s.get('type'), s_earnings), []).append((s, session_dt))
 
     for da in da_entries:
         da_ms = da.get('submittedAtMs')
@@ -543,45 +967,14 @@ def reconcile_da_entries(da_entries, sessions):
             unmatched.append({'da': da})
             continue
 
-        da_date = datetime.fromisoformat(da['submittedAt'])
+        da_date = _as_utc(datetime.fromisoformat(da['submittedAt']))
 
         best_match = None
         best_time_diff = float('inf')
 
-        for session in legacy_sessions:
-            sid = session.get('id', '')
-            if sid in used_session_ids:
-                continue
-            try:
-                s_earnings = round(float(session.get('earnings', 0)), 2)
-            except (ValueError, TypeError):
-                continue
-            if s_earnings != da['amount']:
-                continue
-            if session.get('type') != da['type']:
+        for session, session_dt in legacy_buckets.get((da['type'], da['amount']), ()):
+            if session.get('id', '') in used_session_ids:
                 continue
-
-            session_submitted = session.get('submittedAt')
-            session_date_str = session.get('date', '')
-            session_dt = None
-            if session_submitted:
-                try:
-                    session_dt = datetime.fromisoformat(session_submitted)
-                except ValueError:
-                    session_dt = None
-            if session_dt is None and session_date_str:
-                try:
-                    session_dt = datetime.fromisoformat(session_date_str)
-                except ValueError:
-                    session_dt = None
-            if session_dt is None:
-                continue
-
-            if da_date.tzinfo and not session_dt.tzinfo:
-                session_dt = session_dt.replace(tzinfo=timezone.utc)
-            elif not da_date.tzinfo and session_dt.tzinfo:
-                da_date = da_date.replace(tzinfo=timezone.utc)
-
             time_diff = abs((da_date - session_dt).total_seconds())
             day_diff = time_diff / (60 * 60 * 24)
             if day_diff <= 3 and time_diff < best_time_diff:
@@ -605,6 +998,78 @@ def reconcile_da_entries(da_entries, sessions):
     }
 
 
+def _post_to_apps_script(payload, timeout=30, max_retries=5):
+    """POST one JSON body to Apps Script and return the decoded response.
+
+    Only resent when the request can't have run (request_with_backoff with
+    idempotent=False); a timed-out write may still be in progress.
+    """
+    resp = da_common.request_with_backoff(
+        'POST',
+        da_common.APPS_SCRIPT_URL,
+        max_retries=max_retries,
+        idempotent=False,
+        headers={'Content-Type': 'text/plain'},
+        data=da_common.json_body(payload),
+        timeout=timeout,
+        allow_redirects=True,
+    )
+    return da_common.response_json(resp)
+
+
+def _post_bulk(payloads):
+    """Send a batch of operations in a single 'bulk' request.
+
+    Returns the per-operation results in order, or None if the deployment
+    doesn't support bulk (an older Apps Script version) or the request failed
+    as a whole — the caller then falls back to one POST per operation. A
+    timeout is the exception: the bulk run may still be writing, so every
+    operation is reported failed instead of being sent again; the next
+    scrape reconciles against whatever landed.
+
+    Operations that fail inside an otherwise successful bulk response are
+    retried once as individual requests.
+    """
+    try:
+        result = _post_to_apps_script({'action': 'bulk', 'operations': payloads},
+                                      timeout=BULK_IMPORT_TIMEOUT, max_retries=2)
+    except requests.Timeout as e:
+        log.error(f"  -> Bulk import timed out ({e}); not resending, it may still be running.")
+        return [{'error': 'bulk request timed out; outcome unknown'}] * len(payloads)
+    except Exception as e:
+        log.warning(f"  -> Bulk import request failed ({e}); falling back to per-record requests.")
+        return None
+    results = result.get('results')
+    if not isinstance(results, list) or len(results) != len(payloads):
+        log.warning(f"  -> Bulk import not supported by this Apps Script deployment "
+                    f"({result.get('error', 'unexpected response')}); falling back to per-record requests.")
+        return None
+
+    failed = [i for i, r in enumerate(results) if not isinstance(r, dict) or r.get('error')]
+    if failed:
+        log.warning(f"  -> {len(failed)} bulk operation(s) failed; resending them individually.")
+        for i, retried in zip(failed, _post_each([payloads[i] for i in failed])):
+            results[i] = retried
+    return results
+
+
+def _post_one(payload):
+    """Single-record POST that reports failures as an error result instead of raising."""
+    try:
+        return _post_to_apps_script(payload)
+    except Exception as e:
+        return {'error': f"request failed: {e}"}
+
+
+def _post_each(payloads):
+    """Fallback: one POST per operation, fanned out over a small thread pool.
+
+    Results come back in the same order as `payloads`.
+    """
+    with ThreadPoolExecutor(max_workers=IMPORT_WORKERS) as executor:
+        return list(executor.map(_post_one, payloads))
+
+
 def import_to_sheets(backfills, unmatched, status_updates=None):
     """Push legacy backfills, status updates, and new entries to Google Sheets.
 
@@ -615,48 +1080,40 @@ def import_to_sheets(backfills, unmatched, status_updates=None):
 
     `status_updates` are existing sessions whose scraped DAStatus differs from
     what's on the sheet (and isn't already terminal 'paid'). Status-only writes.
+
+    Writes go to Apps Script as 'bulk' requests of up to BULK_BATCH_SIZE
+    operations; deployments that predate the bulk action get one request per
+    record instead.
+
+    Returns True only if every write succeeded.
     """
     status_updates = status_updates or []
 
     if not da_common.APPS_SCRIPT_URL:
         log.error("APPS_SCRIPT_URL not set — cannot import to Sheets.")
-        return
+        return False
 
     if not backfills and not unmatched and not status_updates:
         log.info("[6/6] Nothing to import — all entries already matched.")
-        return
+        return True
 
     log.info(f"[6/6] Importing to Sheets: {len(backfills)} legacy backfills, "
              f"{len(status_updates)} status updates, {len(unmatched)} new entries...")
     now_iso = datetime.now(tz=timezone.utc).isoformat()
 
+    # Each operation: (Apps Script payload, label for errors, record id, success log line)
+    operations = []
+
     for s in status_updates:
         session = s['session']
         da = s['da']
         updates = {'daStatus': da['daStatus'], 'daStatusAt': now_iso}
-        try:
-            payload = json.dumps({
-                'action': 'update',
-                'tab': 'WorkSessions',
-                'id': session['id'],
-                'updates': updates,
-            })
-            resp = requests.post(
-                da_common.APPS_SCRIPT_URL,
-                headers={'Content-Type': 'text/plain'},
-                data=payload,
-                timeout=30,
-                allow_redirects=True,
-            )
-            result = resp.json()
-            if result.get('error'):
-                log.error(f"  -> Status update failed for {session['id']}: {result['error']}")
-            else:
-                old_status = session.get('daStatus') or '(none)'
-                log.info(f"  -> Status {session['id']}: {old_status} -> {da['daStatus']}")
-        except Exception as e:
-            log.error(f"  -> Status update request failed for {session['id']}: {e}")
-        time.sleep(0.05)
+        old_status = session.get('daStatus') or '(none)'
+        operations.append((
+            {'action': 'update', 'tab': 'WorkSessions', 'id': session['id'], 'updates': updates},
+            'Status update', session['id'],
+            f"  -> Status {session['id']}: {old_status} -> {da['daStatus']}",
+        ))
 
     for b in backfills:
         session = b['session']
@@ -677,31 +1134,19 @@ def import_to_sheets(backfills, unmatched, status_updates=None):
         if da['projectName'] and not session.get('projectId'):
             updates['projectId'] = da['projectName']
 
-        try:
-            payload = json.dumps({
-                'action': 'update',
-                'tab': 'WorkSessions',
-                'id': session['id'],
-                'updates': updates
-            })
-            resp = requests.post(
-                da_common.APPS_SCRIPT_URL,
-                headers={'Content-Type': 'text/plain'},
-                data=payload,
-                timeout=30,
-                allow_redirects=True
-            )
-            result = resp.json()
-            if result.get('error'):
-                log.error(f"  -> Backfill failed for {session['id']}: {result['error']}")
-            else:
-                log.info(f"  -> Backfilled {session['id']}: submittedAtMs={da['submittedAtMs']} ({da['submittedAt'][:19]})")
-        except Exception as e:
-            log.error(f"  -> Backfill request failed for {session['id']}: {e}")
-
-    for u in unmatched:
+        operations.append((
+            {'action': 'update', 'tab': 'WorkSessions', 'id': session['id'], 'updates': updates},
+            'Backfill', session['id'],
+            f"  -> Backfilled {session['id']}: submittedAtMs={da['submittedAtMs']} ({da['submittedAt'][:19]})",
+        ))
+
+    # IDs keep the ws_<ms>_<8 hex> shape: one timestamp and random run tag for
+    # the whole batch, plus a per-record index to keep them distinct.
+    id_base_ms = int(time.time() * 1000)
+    id_run_tag = os.urandom(2).hex()
+    for index, u in enumerate(unmatched):
         da = u['da']
-        record_id = f"ws_{int(time.time() * 1000)}_{os.urandom(4).hex()}"
+        record_id = f"ws_{id_base_ms}_{id_run_tag}{index:04x}"
         user_email = da_common.DA_USER_EMAIL or da_common.DA_EMAIL
         record_date = da['submittedAt'][:10] if da['submittedAt'] else datetime.now().strftime('%Y-%m-%d')
         record = {
@@ -721,28 +1166,102 @@ def import_to_sheets(backfills, unmatched, status_updates=None):
             record['daStatus'] = da['daStatus']
             record['daStatusAt'] = now_iso
 
-        try:
-            payload = json.dumps({
-                'action': 'add',
-                'tab': 'WorkSessions',
-                'record': record
-            })
-            resp = requests.post(
-                da_common.APPS_SCRIPT_URL,
-                headers={'Content-Type': 'text/plain'},
-                data=payload,
-                timeout=30,
-                allow_redirects=True
-            )
-            result = resp.json()
-            if result.get('error'):
-                log.error(f"  -> Add failed for {record_id}: {result['error']}")
-            else:
-                log.info(f"  -> Added {record_id}: ${da['amount']:.2f} {da['type']} on {da['submittedAt'][:10]}")
-        except Exception as e:
-            log.error(f"  -> Add request failed for {record_id}: {e}")
+        operations.append((
+            {'action': 'add', 'tab': 'WorkSessions', 'record': record},
+            'Add', record_id,
+            f"  -> Added {record_id}: ${da['amount']:.2f} {da['type']} on {da['submittedAt'][:10]}",
+        ))
+
+    payloads = [op[0] for op in operations]
+    results = []
+    for start in range(0, len(payloads), BULK_BATCH_SIZE):
+        batch = payloads[start:start + BULK_BATCH_SIZE]
+        batch_results = _post_bulk(batch)
+        if batch_results is None:
+            batch_results = _post_each(batch)
+        results.extend(batch_results)
+
+    failures = 0
+    for (_, label, record_id, success_msg), result in zip(operations, results):
+        if not isinstance(result, dict):
+            log.error(f"  -> {label} failed for {record_id}: unexpected response {result!r}")
+            failures += 1
+        elif result.get('error'):
+            log.error(f"  -> {label} failed for {record_id}: {result['error']}")
+            failures += 1
+        else:
+            log.info(success_msg)
+    return failures == 0
+
+
+def _scrape_hash_file(profile):
+    """Where the hash of the last fully imported scrape is kept for a profile."""
+    return LOG_DIR / f".last_scrape_hash.{profile}"
 
-        time.sleep(0.05)
+
+def entries_digest(da_entries):
+    """Hash of what a scrape found, used to detect an unchanged DA page.
+
+    Built from the parsed entries rather than the page markup, which also
+    carries DA's relative "N days ago" text and so differs from day to day
+    even when no payment has changed.
+    """
+    key = sorted(
+        (e['submittedAtMs'], e['amount'], e['type'], e['daStatus'], e['projectName'], e['duration'])
+        for e in da_entries
+    )
+    return hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def read_last_scrape_hash(profile):
+    """Hash recorded by the last run whose import fully succeeded, or None."""
+    try:
+        return _scrape_hash_file(profile).read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+
+
+def write_last_scrape_hash(profile, digest):
+    """Record a scrape hash; only called once the import has fully succeeded."""
+    try:
+        _scrape_hash_file(profile).write_text(digest, encoding='utf-8')
+    except OSError as e:
+        log.warning(f"  -> Could not record scrape hash: {e}")
+
+
+def reconcile_and_import(da_entries, html_path, sessions_future=None):
+    """Reconcile parsed DA entries against the sheet and import the differences.
+
+    `sessions_future` is a fetch_existing_sessions(da_entries) call already
+    started by the caller; without one the sessions are fetched here.
+    Returns True only if the sessions were fetched and every write succeeded.
+    """
+    # No parser-level dedup — the reconciler handles dedup against
+    # existing sessions. Parser dedup was too aggressive: $10 task
+    # submissions from different reviews can share (timestamp, amount,
+    # type) keys and were being falsely removed.
+
+    if sessions_future is not None:
+        sessions = sessions_future.result()
+    else:
+        sessions = fetch_existing_sessions(da_entries)
+    if sessions is None:
+        log.error("Cannot reconcile without existing sessions. "
+                  f"Aborting import to prevent duplicates. HTML backup: {html_path}")
+        return False
+
+    result = reconcile_da_entries(da_entries, sessions)
+    imported = import_to_sheets(result['backfills'], result['unmatched'], result['status_updates'])
+
+    log.info("")
+    log.info("=" * 55)
+    log.info(" DONE! Data reconciled via API.")
+    log.info(f" {result['total']} DA entries: {len(result['matched'])} matched "
+             f"({len(result['status_updates'])} status updates), "
+             f"{len(result['backfills'])} legacy-backfilled, {len(result['unmatched'])} new")
+    log.info(f" HTML backup: {html_path}")
+    log.info("=" * 55)
+    return imported
 
 
 def main():
@@ -761,11 +1280,18 @@ def main():
                         help="Unattended mode: headless, no prompts")
     parser.add_argument("--profile", default="default",
                         help="Profile name: loads .env.<profile> (e.g., --profile lisa)")
+    parser.add_argument("--from-backup", metavar="PATH",
+                        help="Parse a saved .html/.html.gz backup and import it, without the browser")
     args = parser.parse_args()
 
     if args.profile != 'default':
         reload_profile(args.profile)
 
+    if args.from_backup:
+        log.info(f"Re-importing from backup {args.from_backup}...")
+        reconcile_and_import(parse_da_html(load_html_backup(args.from_backup)), args.from_backup)
+        return
+
     if args.auto:
         args.headless = True
 
@@ -775,43 +1301,56 @@ def main():
         log.error("Missing credentials! Create a .env file with DA_EMAIL and DA_PASSWORD.")
         sys.exit(1)
 
-    with sync_playwright() as p:
+    with sync_playwright() as p, ThreadPoolExecutor(max_workers=1) as parse_executor:
+        # Each page is appended to the backup, then parsed on its own single
+        # worker while the browser moves on to the next one. One worker keeps
+        # the pages in order, which the shared parse state relies on.
+        parse_state = {}
+        parse_futures = []
+
+        def handle_page(rows_html):
+            # Encoded once here; the backup, its hash and the parser all take bytes.
+            rows_html = rows_html.encode("utf-8")
+            backup.add_page(rows_html)
+            if not args.html_only:
+                parse_futures.append(parse_executor.submit(parse_da_html, wrap_rows_html(rows_html), parse_state))
+
         browser, page = create_browser_and_page(p, headless=args.headless, block_payouts=True)
 
         try:
             login_to_da(page)
 
-            html_parts = scrape_all_pages(page, show_paid=args.show_paid)
-            combined_html = combine_html_pages(html_parts)
+            backup = HtmlBackup(compress=not args.html_only)
+            try:
+                scrape_all_pages(page, handle_page, show_paid=args.show_paid)
+            except BaseException:
+                backup.discard()
+                raise
 
-            saved_path = save_html_to_file(combined_html)
+            sessions_future = None
+            if not args.html_only:
+                try:
+                    da_entries = [entry for future in parse_futures for entry in future.result()]
+                except BaseException:
+                    backup.finish()  # keep the raw pages for --from-backup
+                    raise
+                digest = entries_digest(da_entries)
+                unchanged = digest == read_last_scrape_hash(args.profile)
+                if not unchanged:
+                    # The parse worker is idle now; the filtered WorkSessions
+                    # fetch runs there while the backup is compressed and saved.
+                    sessions_future = parse_executor.submit(fetch_existing_sessions, da_entries)
+            saved_path = backup.finish()
 
             if args.html_only:
                 log.info(f"\nDone! HTML saved to: {saved_path}")
-            else:
-                da_entries = parse_da_html(combined_html)
-
-                # No parser-level dedup — the reconciler handles dedup against
-                # existing sessions. Parser dedup was too aggressive: $10 task
-                # submissions from different reviews can share (timestamp, amount,
-                # type) keys and were being falsely removed.
-
-                sessions = fetch_existing_sessions()
-                if sessions is None:
-                    log.error("Cannot reconcile without existing sessions. "
-                              "Aborting import to prevent duplicates. HTML backup saved.")
-                else:
-                    result = reconcile_da_entries(da_entries, sessions)
-                    import_to_sheets(result['backfills'], result['unmatched'], result['status_updates'])
-
-                    log.info("")
-                    log.info("=" * 55)
-                    log.info(" DONE! Data reconciled via API.")
-                    log.info(f" {result['total']} DA entries: {len(result['matched'])} matched "
-                             f"({len(result['status_updates'])} status updates), "
-                             f"{len(result['backfills'])} legacy-backfilled, {len(result['unmatched'])} new")
-                    log.info(f" HTML backup: {saved_path}")
-                    log.info("=" * 55)
+            elif unchanged:
+                # Same entries as the last scrape that imported cleanly, so
+                # the sheet already reflects everything on this page.
+                log.info("  -> DA payments unchanged since last successful import — skipping reconcile/import.")
+                log.info(f"\nDone! HTML backup: {saved_path}")
+            elif reconcile_and_import(da_entries, saved_path, sessions_future):
+                write_last_scrape_hash(args.profile, digest)
 
         except Exception as e:
             log.error(f"ERROR: {e}")